@@ -1,6 +1,188 @@
 import gradio as gr
+import atexit
+import functools
 import json
+import mmap
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from bisect import bisect_left, insort
+from collections import deque
 from datetime import date, datetime
+from operator import attrgetter
+from typing import Final
+
+try:
+    import orjson  # faster JSON saving/loading when it is installed
+except ImportError:
+    orjson = None
+
+# Number of position logs kept per ship; older entries are dropped
+POSITION_LOG_LIMIT = 500
+
+# Once the save journal is bigger than this (in bytes), the next save writes
+# a full snapshot and starts a new journal
+JOURNAL_COMPACT_SIZE = 64 * 1024
+
+# Most unsaved changes remembered for the journal. Past this, they are
+# dropped and the next save writes a full snapshot instead.
+JOURNAL_MAX_CHANGES = 10_000
+
+# Last formatted timestamp, reused while we are still in the same second
+_last_timestamp = (None, "")
+
+
+def _timestamp() -> str:
+    # Return the current time as "YYYY-MM-DD HH:MM:SS"
+    global _last_timestamp
+    second = int(time.time())
+    if _last_timestamp[0] != second:
+        _last_timestamp = (
+            second, datetime.fromtimestamp(second).isoformat(sep=" "))
+    return _last_timestamp[1]
+
+
+def _dump_json(data) -> bytes:
+    # Encode fleet data as compact JSON bytes, using orjson when available
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _load_json(raw):
+    # Decode JSON from the fleet file's bytes. orjson can read a memoryview
+    # directly; the json module needs a bytes copy.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
+
+def _read_json_file(filename: str):
+    # Memory-map the file and parse it in place rather than reading it into
+    # a separate buffer first
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _load_json(b"")  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _load_json(view)
+
+
+def _write_json_file(filename: str, data):
+    # Write to a temporary file first and swap it in afterwards, so a
+    # crash mid-save never leaves a half-written registry behind
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, 'wb') as f:
+        f.write(_dump_json(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+
+def _journal_name(filename: str) -> str:
+    # The journal of changes made since `filename` was last fully written
+    return filename + ".journal"
+
+
+def _file_mtime(filename: str):
+    # Modification time of a file in nanoseconds, or None if it doesn't exist
+    try:
+        return os.stat(filename).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _journal_size(filename: str) -> int:
+    # Size of the journal in bytes, or 0 if there isn't one yet
+    try:
+        return os.path.getsize(_journal_name(filename))
+    except FileNotFoundError:
+        return 0
+
+
+def _append_journal(filename: str, snapshot_id: int, changes: list):
+    # Add changes to the end of the journal, one JSON object per line.
+    # A new journal starts with a line naming the snapshot it follows on from.
+    with open(_journal_name(filename), 'ab') as f:
+        if f.tell() == 0:
+            f.write(_dump_json({"op": "start", "snapshot_id": snapshot_id}) + b"\n")
+        f.write(b"".join(_dump_json(change) + b"\n" for change in changes))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_journal(filename: str, snapshot_id):
+    # Return the changes journaled since the snapshot with this id, and
+    # whether the whole journal could be used
+    try:
+        with open(_journal_name(filename), 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return [], True
+    if not lines:
+        return [], True
+    try:
+        start = _load_json(lines[0])
+    except ValueError:
+        start = None
+    if start != {"op": "start", "snapshot_id": snapshot_id}:
+        return [], False  # left over from an older snapshot
+    changes = []
+    for line in lines[1:]:
+        try:
+            changes.append(_load_json(line))
+        except ValueError:
+            # the program stopped part way through a save; keep what came before
+            return changes, False
+    return changes, True
+
+
+def _save_worker(save_queue: queue.Queue, errors: list, on_disk: dict):
+    # Background thread: write each queued (version, filename, data,
+    # base_version, changes) save. When the file already holds base_version,
+    # only the changes are appended to its journal; otherwise the full
+    # snapshot is written and the journal is started again.
+    # on_disk maps filename -> (version, snapshot_id, mtime) of what is in it.
+    # Failures are kept in `errors` so the next save can report them.
+    while True:
+        version, filename, data, base_version, changes = save_queue.get()
+        try:
+            disk = on_disk.get(filename)
+            if disk is not None and disk[2] != _file_mtime(filename):
+                disk = None  # replaced by someone else since
+            if disk is not None and disk[0] >= version:
+                pass  # this version is already written
+            elif (disk is not None and disk[0] == base_version and disk[1] is not None
+                  and changes and _journal_size(filename) <= JOURNAL_COMPACT_SIZE):
+                _append_journal(filename, disk[1], changes)
+                on_disk[filename] = (version, disk[1], disk[2])
+            else:
+                data["snapshot_id"] = snapshot_id = time.time_ns()
+                _write_json_file(filename, data)
+                # the new snapshot already includes everything journaled
+                try:
+                    os.remove(_journal_name(filename))
+                except FileNotFoundError:
+                    pass
+                on_disk[filename] = (version, snapshot_id, _file_mtime(filename))
+        except Exception as e:
+            on_disk.pop(filename, None)  # write everything next time
+            errors.append(e)
+        finally:
+            save_queue.task_done()
+
+
+def _display_date(launch_date) -> str:
+    # Launch date as shown in ship details: ISO date-times show just the date
+    if isinstance(launch_date, str):
+        try:
+            return str(datetime.fromisoformat(launch_date).date())
+        except ValueError:
+            return launch_date  # Keep as string if not ISO formatted
+    return str(launch_date)
 
 # ============================================================
 # 🛳 Base Boat Class
@@ -8,6 +190,15 @@ from datetime import date, datetime
 
 
 class Boat:
+    # Fixed list of attributes, so boats don't each carry a __dict__
+    __slots__ = (
+        "name", "launch_date", "home_port", "flag", "_launch_date_str",
+        "_name_lc", "_home_port_lc", "_flag_lc", "_search_blob",
+        "_current_fleet", "_fleet_history", "current_position",
+        "_log_times", "_log_positions", "_repr_cache", "_dict_cache",
+        "_history_cache",
+    )
+
     # Create name, launch date, home port, and flag parameters for the ship
     def __init__(self, name: str, launch_date, home_port: str, flag: str):
         # Validate input types and values
@@ -24,64 +215,149 @@ class Boat:
         if isinstance(launch_date, (int, float)):
             launch_date = datetime.fromtimestamp(launch_date).date()
 
+        # Format the launch date once for display
+        self._setup(name, launch_date, _display_date(launch_date), home_port, flag)
+
+    @classmethod
+    def _from_trusted(cls, name: str, launch_date: str, home_port: str, flag: str):
+        # Rebuild a boat from data this app saved itself, skipping the checks
+        # in __init__
+        boat = cls.__new__(cls)
+        boat._setup(name, launch_date, _display_date(launch_date), home_port, flag)
+        return boat
+
+    def _setup(self, name, launch_date, launch_date_str, home_port, flag):
         # Store attributes
         self.name = name
         self.launch_date = launch_date
         self.home_port = home_port
         self.flag = flag
+        self._launch_date_str = launch_date_str
+
+        # Lowercase copies of the searchable fields, so filtering doesn't
+        # have to lowercase them again on every search
+        self._name_lc = name.lower()
+        self._home_port_lc = home_port.lower()
+        self._flag_lc = flag.lower()
+        # All three joined together so a search only needs one "in" check
+        self._search_blob = f"{self._name_lc}\x00{self._home_port_lc}\x00{self._flag_lc}"
 
-        # Track which fleet does this boat belong to
-        self.current_fleet = None
+        # Track which fleet does this boat belong to. Fleets are held through
+        # weak references so a boat doesn't keep an old fleet alive.
+        self._current_fleet = None
 
         # Keep a record of all fleets
-        self.fleet_history = []
+        self._fleet_history = []
 
         # Track ship position and position history
         self.current_position = None
-        self.position_logs = []
-
-    # Create and return a dictionary containing all ship information
+        # Position history kept as two matching columns: when and where.
+        # Only the latest POSITION_LOG_LIMIT entries are kept.
+        self._log_times = deque(maxlen=POSITION_LOG_LIMIT)
+        self._log_positions = deque(maxlen=POSITION_LOG_LIMIT)
+
+        # Cached display text, saved dictionary and position history text,
+        # cleared whenever the ship changes
+        self._repr_cache = None
+        self._dict_cache = None
+        self._history_cache = None
+
+    @property
+    def current_fleet(self):
+        # The fleet this boat belongs to, or None
+        if self._current_fleet is None:
+            return None
+        return self._current_fleet()
+
+    @current_fleet.setter
+    def current_fleet(self, fleet):
+        self._current_fleet = weakref.ref(fleet) if fleet is not None else None
+
+    @property
+    def fleet_history(self) -> list:
+        # Fleets this boat has belonged to that still exist
+        return [fleet for ref in self._fleet_history if (fleet := ref()) is not None]
+
+    def _join_fleet(self, fleet):
+        # Point the boat at its new fleet and add it to the history
+        self.current_fleet = fleet
+        self._fleet_history.append(weakref.ref(fleet))
+
+    def _invalidate(self):
+        # Forget cached output after the ship's details change, and let the
+        # fleet know so its cached reports are rebuilt too
+        self._repr_cache = None
+        self._dict_cache = None
+        self._history_cache = None
+        fleet = self.current_fleet
+        if fleet is not None:
+            fleet._version += 1
+
+    # Return a dictionary containing all ship information
     def to_dict(self) -> dict:
+        # Reuse the last dictionary unless the ship changed since it was built
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+
+    # Create and return a new dictionary containing all ship information
+    def _build_dict(self) -> dict:
         return {
+            "type": type(self).__name__,  # Which boat class to load it as
             "name": self.name,  # Ship's name
             "launch_date": str(self.launch_date), # Convert date object to string
             "home_port": self.home_port,  # Home port name
             "flag": self.flag,  # Country flag
             "current_position": self.current_position,  # Current position
-            "position_logs": self.position_logs  # Position history
+            "position_log_times": list(self._log_times),  # When each position was logged
+            "position_log_positions": list(self._log_positions)  # Where the ship was
         }
 
+    @property
+    def position_logs(self) -> list:
+        # Position history formatted as "[time] Position: place" lines
+        return [f"[{t}] Position: {p}" for t, p in zip(self._log_times, self._log_positions)]
+
     def log_position(self, position: str):
         # Log the ship's current position
-        timestamp = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        self.current_position = position
-        log_entry = f"[{timestamp}] Position: {position}"
-        self.position_logs.append(log_entry)
+        timestamp = _timestamp()
+        self._add_position(timestamp, position)
+        fleet = self.current_fleet
+        if fleet is not None:
+            fleet._journal({"op": "position", "name": self.name,
+                            "time": timestamp, "position": position})
         return f"📍 {self.name} position logged: {position}"
 
+    def _add_position(self, timestamp: str, position: str):
+        # Move the ship and add the position to its history
+        self.current_position = position
+        self._log_times.append(timestamp)
+        self._log_positions.append(position)
+        self._invalidate()
+
     def get_position_history(self):
-        # Get the ship's position history
-        if not self.position_logs:
+        # Get the ship's position history, reusing the text until a new
+        # position is logged
+        if not self._log_times:
             return f"🗒️ No position logs recorded for {self.name}."
-        return f"📍 Position History for {self.name}:\n" + "\n".join(self.position_logs)
+        if self._history_cache is None:
+            self._history_cache = f"📍 Position History for {self.name}:\n" + "\n".join(self.position_logs)
+        return self._history_cache
 
     # Return text to display ship information
     def __repr__(self) -> str:
-        launch_date = self.launch_date
-        # Format the launch date properly
-        if isinstance(self.launch_date, (int, float)):
-            launch_date = str(datetime.fromtimestamp(launch_date).date())
-        elif isinstance(self.launch_date, str):
-            try:
-                launch_date = str(datetime.fromisoformat(launch_date).date())
-            except ValueError:
-                pass  # Keep as string if not ISO formatted
+        # Reuse the last rendered text until the ship changes
+        if self._repr_cache is None:
+            self._repr_cache = self._render()
+        return self._repr_cache
 
+    def _render(self) -> str:
+        # Build the display text for the ship
         position_info = f"Current Position: {self.current_position}" if self.current_position else "Current Position: Unknown"
 
         return (
             f"Ship Name: {self.name}\n"
-            f"Launch Date: {launch_date}\n"
+            f"Launch Date: {self._launch_date_str}\n"
             f"Home Port: {self.home_port}\n"
             f"Flag: {self.flag}\n"
             f"{position_info}"
@@ -95,6 +371,8 @@ class Boat:
 
 
 class CargoBoat(Boat):
+    __slots__ = ("cargo_capacity",)
+
     def __init__(self, name: str, launch_date, home_port: str, flag: str, cargo_capacity: float):
         # reuse parameters from parent class Boat
         super().__init__(name, launch_date, home_port, flag)
@@ -112,16 +390,23 @@ class CargoBoat(Boat):
         # store cargo_capacity attributes
         self.cargo_capacity = cargo_capacity
 
-    def to_dict(self) -> dict:
+    @classmethod
+    def _from_trusted(cls, name, launch_date, home_port, flag, cargo_capacity):
+        # Rebuild a saved cargo ship without re-running validation
+        boat = super()._from_trusted(name, launch_date, home_port, flag)
+        boat.cargo_capacity = cargo_capacity
+        return boat
+
+    def _build_dict(self) -> dict:
         # Create and return a dictionary containing cargo ship information
-        base_dict = super().to_dict()  # Get dictionary from the parent Boat class
+        base_dict = super()._build_dict()  # Get dictionary from the parent Boat class
         # Add cargo-specific field
         base_dict["cargo_capacity"] = self.cargo_capacity
         return base_dict
 
-    def __repr__(self) -> str:
+    def _render(self) -> str:
         # Return text to display cargo ship information
-        base_info = super().__repr__()  # Reuse parent's display text
+        base_info = super()._render()  # Reuse parent's display text
         return (
             f"{base_info}\n"
             f"Cargo Capacity: {self.cargo_capacity:.2f} tons"
@@ -135,6 +420,8 @@ class CargoBoat(Boat):
 
 
 class MilitaryBoat(Boat):
+    __slots__ = ("weapon_count", "is_authorised_by_gov")
+
     def __init__(self, name: str, launch_date, home_port: str, flag: str, weapon_count: float, is_authorised_by_gov: bool):
         # reuse parameters from parent class Boat
         super().__init__(name, launch_date, home_port, flag)
@@ -157,80 +444,274 @@ class MilitaryBoat(Boat):
         self.weapon_count = weapon_count
         self.is_authorised_by_gov = is_authorised_by_gov
 
-    def to_dict(self) -> dict:
+    @classmethod
+    def _from_trusted(cls, name, launch_date, home_port, flag, weapon_count, is_authorised_by_gov):
+        # Rebuild a saved military ship without re-running validation
+        boat = super()._from_trusted(name, launch_date, home_port, flag)
+        boat.weapon_count = weapon_count
+        boat.is_authorised_by_gov = is_authorised_by_gov
+        return boat
+
+    def _build_dict(self) -> dict:
         # Create and return a dictionary containing military ship information
-        base_dict = super().to_dict()  # Get dictionary from the parent Boat class
+        base_dict = super()._build_dict()  # Get dictionary from the parent Boat class
 
         # -- Add military-specific field --
         base_dict["weapon_count"] = self.weapon_count
         base_dict["is_authorised_by_gov"] = self.is_authorised_by_gov
         return base_dict
 
-    def __repr__(self) -> str:
+    def _render(self) -> str:
         # Return text to display military ship information
-        base_info = super().__repr__()  # Reuse parent's display text
+        base_info = super()._render()  # Reuse parent's display text
         return (
             f"{base_info}\n"
             f"Weapon Count: {self.weapon_count}\n"
             f"Authorised by Government: {self.is_authorised_by_gov}"
         )
 
+# Map exact boat classes to their bucket in the fleet status counters
+_BOAT_KINDS = {CargoBoat: "cargo", MilitaryBoat: "military"}
+
+# Boat classes by the "type" name stored in the saved file
+_BOAT_CLASSES = {"Boat": Boat, "CargoBoat": CargoBoat, "MilitaryBoat": MilitaryBoat}
+
+# Saved fields passed to each boat class's constructor, in order
+_BOAT_CTOR_KEYS = {
+    Boat: ("name", "launch_date", "home_port", "flag"),
+    CargoBoat: ("name", "launch_date", "home_port", "flag", "cargo_capacity"),
+    MilitaryBoat: ("name", "launch_date", "home_port", "flag",
+                   "weapon_count", "is_authorised_by_gov"),
+}
+
+
+def _saved_boat_class(boat_data: dict):
+    # Pick the class for a saved boat. Files saved before the "type" field
+    # existed are told apart by their extra fields instead.
+    boat_type = boat_data.get("type")
+    if boat_type is not None:
+        return _BOAT_CLASSES[boat_type]
+    if "cargo_capacity" in boat_data:
+        return CargoBoat
+    if "weapon_count" in boat_data:
+        return MilitaryBoat
+    return Boat
+
+
+def _boat_from_saved(boat_data: dict):
+    # Create the right kind of boat from the saved data
+    boat_class = _saved_boat_class(boat_data)
+    # The file was written by save_to_file, so skip re-validating it
+    boat = boat_class._from_trusted(
+        *(boat_data[key] for key in _BOAT_CTOR_KEYS[boat_class]))
+
+    # Restore position data if available
+    if "current_position" in boat_data:
+        boat.current_position = boat_data["current_position"]
+    if "position_log_times" in boat_data:
+        boat._log_times.extend(boat_data["position_log_times"])
+        boat._log_positions.extend(boat_data["position_log_positions"])
+    elif "position_logs" in boat_data:
+        # Older files store each log as one "[time] Position: place" line
+        for entry in boat_data["position_logs"]:
+            logged_at, _, position = entry.partition("] Position: ")
+            boat._log_times.append(logged_at.lstrip("["))
+            boat._log_positions.append(position)
+    boat._invalidate()
+    return boat
+
+# Sort key for ordering boats by name
+_boat_name = attrgetter("name")
+
+
+
+def _cached_by_version(method):
+    # Reuse a Fleet method's last result until the fleet's version changes
+    @functools.wraps(method)
+    def wrapper(self):
+        cached = self._text_cache.get(method.__name__)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        # read the version first, so text built while another handler
+        # changes the fleet is never saved under the newer version
+        version = self._version
+        result = method(self)
+        self._text_cache[method.__name__] = (version, result)
+        return result
+    return wrapper
+
 # ============================================================
 # ⚓ Fleet Class
 # ============================================================
 
 class Fleet:
     def __init__(self):
-        self.boats = []  # store all boars in the fleet
         self.logs = []    # store log entries
+        # Goes up on every change, so cached report text can tell it is stale
+        self._version = 0
+        self._text_cache = {}  # method name -> (version, text)
+        self._last_filter = (None, None, "")  # (version, keyword, text) of the last filter
+        self._clear_boats()
+        # Saves are written by a background thread, started on first save.
+        # The queue holds at most one snapshot waiting to be written.
+        self._save_queue = queue.Queue(maxsize=1)
+        self._save_thread = None
+        self._save_errors = []
+        # filename -> (version, snapshot_id, mtime) last written or loaded
+        self._on_disk = {}
+        # Changes since the last save, so a save can append just these to
+        # the journal instead of rewriting the whole file
+        self._changes = []
+        self._saved_version = None  # fleet version the changes start from
+        # File modification times and fleet version after the last load, so
+        # loading an unchanged file into an unchanged fleet can be skipped
+        self._loaded_mtime = None
+        self._loaded_version = None
+
+    def _clear_boats(self):
+        # Empty the fleet and reset every index kept alongside the boats
+        self._version += 1
+        self.boats = []  # store all boars in the fleet
+        self.boats_by_name = {}  # look up boats by name without scanning the list
+        self._index = {}  # id of each boat -> its position in self.boats
+        self._sorted_by_name = []  # the same boats, always kept in name order
+        self._name_cache = []  # boat names in the same order as self.boats
+        # (lowercased search text, boat) pairs in the same order as self.boats
+        self._search_index = []
+        # running totals for the status report
+        self._counts = {"cargo": 0, "military": 0, "regular": 0}
+        self._total_cargo = 0.0
+        # Quick "can this keyword match at all?" checks for filter_boats.
+        # They only grow as boats are added, so they may allow a search
+        # that finds nothing, but they never rule out a real match.
+        self._max_field_len = 0
+        self._search_bigrams = set()
+
+    def _track(self, boat):
+        # Add a boat to the list and to the lookup indexes
+        self._version += 1
+        self._index[id(boat)] = len(self.boats)
+        self.boats.append(boat)
+        self._name_cache.append(boat.name)
+        self._search_index.append((boat._search_blob, boat))
+        self.boats_by_name[boat.name] = boat
+        insort(self._sorted_by_name, boat, key=_boat_name)
+        kind = _BOAT_KINDS.get(type(boat), "regular")
+        self._counts[kind] += 1
+        if kind == "cargo":
+            self._total_cargo += boat.cargo_capacity
+        for field in (boat._name_lc, boat._home_port_lc, boat._flag_lc):
+            self._max_field_len = max(self._max_field_len, len(field))
+            self._search_bigrams.update(
+                field[i:i + 2] for i in range(len(field) - 1))
+
+    def _untrack(self, boat):
+        # Remove a boat from the list and from the lookup indexes.
+        # The last boat is moved into the gap so nothing needs shifting.
+        self._version += 1
+        pos = self._index.pop(id(boat))
+        last = self.boats.pop()
+        last_name = self._name_cache.pop()
+        last_entry = self._search_index.pop()
+        if last is not boat:
+            self.boats[pos] = last
+            self._name_cache[pos] = last_name
+            self._search_index[pos] = last_entry
+            self._index[id(last)] = pos
+        del self.boats_by_name[boat.name]
+        # names are unique, so the first match is this boat
+        del self._sorted_by_name[bisect_left(self._sorted_by_name, boat.name, key=_boat_name)]
+        kind = _BOAT_KINDS.get(type(boat), "regular")
+        self._counts[kind] -= 1
+        if kind == "cargo":
+            self._total_cargo -= boat.cargo_capacity
+        if not self.boats:
+            self._max_field_len = 0
+            self._search_bigrams = set()
 
     # add boat to fleet
     def add_boat(self, boat):
-        if not isinstance(boat, Boat):
-            return "❌ Only Boat objects can be added."
-        self.boats.append(boat)
-        boat.current_fleet = self
-        boat.fleet_history.append(self)
-        self.record_log(f"{boat.name} joined the fleet.")
-        return f"✅ {boat.name} successfully added to fleet"
-
+        return self.add_boats([boat])[0]
+
+    # add several boats to fleet at once, returning one message per boat
+    def add_boats(self, boats):
+        timestamp = _timestamp()  # one timestamp shared by the whole batch
+        results = []
+        for boat in boats:
+            if not isinstance(boat, Boat):
+                results.append("❌ Only Boat objects can be added.")
+                continue
+            # ship names must be unique so they can be looked up by name
+            if boat.name in self.boats_by_name:
+                results.append(f"❌ A ship named {boat.name} is already in the fleet.")
+                continue
+            self._track(boat)
+            boat._join_fleet(self)
+            self._journal({"op": "add", "boat": boat.to_dict()})
+            self.record_log(f"{boat.name} joined the fleet.", timestamp)
+            results.append(f"✅ {boat.name} successfully added to fleet")
+        return results
+
+    @_cached_by_version
     def list_boats(self):
         if not self.boats:
             return "The fleet is empty!"
-        return "\n\n".join(str(b) for b in self.boats)  # Join all boat details
+        # Join all boat details, using each boat's saved text when it has one
+        return "\n\n".join(b._repr_cache or repr(b) for b in self.boats)
 
     def sort_boats(self, by="name"):
         if not self.boats:
             return "Empty fleet, no boats to sort"
 
-         # Sort the list of boats alphabetically by name
-        self.boats.sort(key=lambda boat: boat.name)
+         # Sort the list of boats alphabetically by name, using the copy
+         # that is already kept in name order
+        self.boats = list(self._sorted_by_name)
+        self._index = {id(b): i for i, b in enumerate(self.boats)}
+        self._name_cache.sort()
+        self._search_index = [(b._search_blob, b) for b in self.boats]
+        self._version += 1
+        self._journal({"op": "sort"})
         return "✅ Fleet sorted by ship name."
 
     def filter_boats(self, keyword):
         if not self.boats:
             return "Fleet is empty, no boats to filter."
 
+        # the same search on an unchanged fleet gives the same answer
+        version, last_keyword, text = self._last_filter
+        if version == self._version and last_keyword == keyword:
+            return text
+
+        version = self._version  # before the scan, as in _cached_by_version
         # create a list of matching boats
-        results = [
-            b for b in self.boats
-            if keyword.lower() in b.name.lower()
-            or keyword.lower() in b.home_port.lower()
-            or keyword.lower() in b.flag.lower()
-        ]
+        kw = keyword.lower()
+        # skip the scan when no boat field is long enough or has every
+        # two-letter piece of the keyword
+        if len(kw) > self._max_field_len or any(
+                kw[i:i + 2] not in self._search_bigrams for i in range(len(kw) - 1)):
+            results = []
+        else:
+            results = [b for text, b in self._search_index if kw in text]
 
         # if no match, return message
         if not results:
-            return f"No results found for {keyword}."
-        # join all matching boat details
-        return "\n\n".join(str(b) for b in results)
+            text = f"No results found for {keyword}."
+        else:
+            # join all matching boat details
+            text = "\n\n".join(b._repr_cache or repr(b) for b in results)
+        self._last_filter = (version, keyword, text)
+        return text
 
     def transfer_boat(self, boat, new_fleet):
         # check if boat exists in fleet
-        if boat not in self.boats:
+        if id(boat) not in self._index:
             return f"❌ {boat.name} not found in this fleet."
+        # check the other fleet can take it before removing it from this one
+        if boat.name in new_fleet.boats_by_name:
+            return f"❌ The other fleet already has a ship named {boat.name}."
         # remove from this fleet
-        self.boats.remove(boat)
+        self._untrack(boat)
+        self._journal({"op": "remove", "name": boat.name})
         self.record_log(f"{boat.name} left this fleet for another.")
         # add to new fleet
         new_fleet.add_boat(boat)
@@ -240,38 +721,51 @@ class Fleet:
 
     def remove_boat(self, boat):
         """Remove a boat from the fleet"""
-        if boat not in self.boats:
+        if id(boat) not in self._index:
             return f"❌ {boat.name} not found in this fleet."
-        self.boats.remove(boat)
+        self._untrack(boat)
         boat.current_fleet = None
+        self._journal({"op": "remove", "name": boat.name})
         self.record_log(f"{boat.name} was removed from the fleet.")
         return f"✅ {boat.name} successfully removed from fleet"
 
     def record_arrival(self, boat: Boat, location: str):
-        if boat not in self.boats:
+        if id(boat) not in self._index:
             return f"❌ {boat.name} is not in this fleet."
         self.record_log(f"{boat.name} arrived at {location}.")
         return f"📍 {boat.name} arrival recorded at {location}."
 
-    def record_log(self, message: str):
-        timestamp = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    def record_log(self, message: str, timestamp: str = None):
+        if timestamp is None:
+            timestamp = _timestamp()
         entry = f"[{timestamp}] {message}"
         self.logs.append(entry)
-
+        self._version += 1
+        self._journal({"op": "log", "entry": entry})
+
+    def _journal(self, change: dict):
+        # Remember a change so the next save can write just the changes
+        if len(self._changes) >= JOURNAL_MAX_CHANGES:
+            # too many to keep around; the next save writes everything
+            self._changes = []
+            self._saved_version = None
+        self._changes.append(change)
+
+    @_cached_by_version
     def show_logs(self):
         if not self.logs:
             return "🗒️ No logs recorded yet."
         return "\n".join(self.logs)
 
+    @_cached_by_version
     def generate_status_report(self):
         if not self.boats:
             return "📊 Fleet Status Report:\n\nFleet is currently empty."
 
         total_boats = len(self.boats)
-        cargo_boats = sum(1 for b in self.boats if isinstance(b, CargoBoat))
-        military_boats = sum(
-            1 for b in self.boats if isinstance(b, MilitaryBoat))
-        regular_boats = total_boats - cargo_boats - military_boats
+        cargo_boats = self._counts["cargo"]
+        military_boats = self._counts["military"]
+        regular_boats = self._counts["regular"]
 
         report = f"📊 Fleet Status Report:\n\n"
         report += f"Total Boats: {total_boats}\n"
@@ -280,277 +774,358 @@ class Fleet:
         report += f"Military Boats: {military_boats}\n"
 
         if cargo_boats > 0:
-            total_cargo_capacity = sum(
-                b.cargo_capacity for b in self.boats if isinstance(b, CargoBoat))
-            report += f"Total Cargo Capacity: {total_cargo_capacity:.2f} tons\n"
+            report += f"Total Cargo Capacity: {self._total_cargo:.2f} tons\n"
 
         return report
 
     def save_to_file(self):
-        try:
-            filename = "fleet_data.json"
-            data = {
-                "boats": [boat.to_dict() for boat in self.boats],
-                "logs": self.logs,
-                "saved_date": str(date.today())
-            }
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
-            return f"✅ Fleet data saved to {filename}"
-        except Exception as e:
-            return f"❌ Error saving fleet data: {e}"
+        filename = "fleet_data.json"
+        # Take a snapshot now; encoding and writing happen in the background
+        data = {
+            "boats": [boat.to_dict() for boat in self.boats],
+            "logs": self.logs[:],
+            "saved_date": str(date.today())
+        }
+        self._queue_save((self._version, filename, data, self._saved_version, self._changes))
+        self._changes = []
+        self._saved_version = self._version
+
+        # Report a failure from an earlier background save, if there was one
+        if self._save_errors:
+            error = self._save_errors.pop()
+            self._save_errors.clear()
+            return f"❌ Error saving fleet data: {error}. Trying again with the latest data."
+        return f"💾 Fleet data is being saved to {filename}"
+
+    def _queue_save(self, snapshot):
+        # Replace any snapshot that is still waiting to be written, so a burst
+        # of saves only writes the newest state. The replaced save's changes
+        # are kept when the new save follows on from it, so the journal can
+        # still be appended to.
+        while True:
+            try:
+                self._save_queue.put_nowait(snapshot)
+                break
+            except queue.Full:
+                try:
+                    old_version, _, _, base_version, changes = self._save_queue.get_nowait()
+                    self._save_queue.task_done()
+                    version, filename, data, new_base, new_changes = snapshot
+                    if new_base == old_version:
+                        snapshot = (version, filename, data, base_version, changes + new_changes)
+                except queue.Empty:
+                    pass  # the writer just took it, so try again
+
+        if self._save_thread is None:
+            self._save_thread = threading.Thread(
+                target=_save_worker, args=(self._save_queue, self._save_errors, self._on_disk),
+                daemon=True)
+            self._save_thread.start()
+            # finish any pending save before the program exits
+            atexit.register(self._save_queue.join)
+
+    def flush_saves(self):
+        # Wait until every queued save has been written to disk
+        self._save_queue.join()
 
     def load_from_file(self):
+        self.flush_saves()  # don't read the file while a save is still pending
+        filename = "fleet_data.json"
         try:
-            filename = "fleet_data.json"
-            with open(filename, 'r') as f:
-                data = json.load(f)
-
-            self.boats = []  # Clear existing boats
+            mtime = os.stat(filename).st_mtime_ns
+            file_mtimes = (mtime, _file_mtime(_journal_name(filename)))
+            if file_mtimes == self._loaded_mtime and self._version == self._loaded_version:
+                return f"ℹ️ Fleet is already up to date with {filename}"
+            data = _read_json_file(filename)
+            snapshot_id = data.get("snapshot_id")
+            changes, journal_ok = _read_journal(filename, snapshot_id)
+
+            self._clear_boats()  # Clear existing boats and their indexes
             self.logs = data.get("logs", [])  # load logs
+            self._version += 1
 
+            renamed = []  # (old name, new name) of ships whose name was taken
             for boat_data in data.get("boats", []):
-                # Parse the launch date from the saved data
-                launch_date = boat_data["launch_date"]
-
-                if "cargo_capacity" in boat_data:
-                    boat = CargoBoat(
-                        boat_data["name"],
-                        launch_date,
-                        boat_data["home_port"],
-                        boat_data["flag"],
-                        boat_data["cargo_capacity"]
-                    )
-                elif "weapon_count" in boat_data:
-                    boat = MilitaryBoat(
-                        boat_data["name"],
-                        launch_date,
-                        boat_data["home_port"],
-                        boat_data["flag"],
-                        boat_data["weapon_count"],
-                        boat_data["is_authorised_by_gov"]
-                    )
-                else:
-                    boat = Boat(
-                        boat_data["name"],
-                        launch_date,
-                        boat_data["home_port"],
-                        boat_data["flag"]
-                    )
-
-                # Restore position data if available
-                if "current_position" in boat_data:
-                    boat.current_position = boat_data["current_position"]
-                if "position_logs" in boat_data:
-                    boat.position_logs = boat_data["position_logs"]
-
-                self.boats.append(boat)
-                boat.current_fleet = self
-                boat.fleet_history.append(self)
-
+                # Older files may repeat a ship name. Keep the later ships
+                # too, numbered so every name is unique.
+                name = boat_data["name"]
+                if name in self.boats_by_name:
+                    number = 2
+                    while f"{name} ({number})" in self.boats_by_name:
+                        number += 1
+                    boat_data = {**boat_data, "name": f"{name} ({number})"}
+                    renamed.append((name, boat_data["name"]))
+                boat = _boat_from_saved(boat_data)
+                self._track(boat)
+                boat._join_fleet(self)
+
+            # Replay the changes saved to the journal since the snapshot
+            for change in changes:
+                op = change["op"]
+                if op == "add":
+                    if change["boat"]["name"] not in self.boats_by_name:
+                        boat = _boat_from_saved(change["boat"])
+                        self._track(boat)
+                        boat._join_fleet(self)
+                elif op == "remove":
+                    boat = self.boats_by_name.get(change["name"])
+                    if boat is not None:
+                        self._untrack(boat)
+                        boat.current_fleet = None
+                elif op == "sort":
+                    self.sort_boats()
+                elif op == "position":
+                    boat = self.boats_by_name.get(change["name"])
+                    if boat is not None:
+                        boat._add_position(change["time"], change["position"])
+                elif op == "log":
+                    self.logs.append(change["entry"])
+
+            for name, new_name in renamed:
+                self.record_log(f"{name} was loaded as {new_name} because the name was already taken.")
+
+            # The fleet now matches the file. A journal that couldn't be fully
+            # used is replaced by a full snapshot on the next save, and so is
+            # a file whose ships had to be renamed.
+            self._changes = []
+            self._saved_version = self._version
+            if renamed:
+                self._on_disk.pop(filename, None)
+            else:
+                self._on_disk[filename] = (
+                    self._version, snapshot_id if journal_ok else None, mtime)
+            self._loaded_mtime = file_mtimes
+            self._loaded_version = self._version
+            if renamed:
+                return (f"✅ Loaded {len(self.boats)} boats from {filename} "
+                        f"({len(renamed)} renamed because their names were already taken)")
             return f"✅ Loaded {len(self.boats)} boats from {filename}"
         except FileNotFoundError:
             return "ℹ️ No saved fleet data found. Starting with empty fleet."
         except Exception as e:
+            self._on_disk.pop(filename, None)  # write everything on the next save
             return f"❌ Error loading fleet data: {e}"
 
 # ============================================================
 # 🌐 Gradio UI (User Interface)
 # ============================================================
 
-def create_ui(registry: Fleet):
-    # Creates the Gradio web interface.
-  # Helper functions to interact with the registry and update the UI
-    def add_and_update(name, location, flag, launch_date, ship_type, cargo_capacity, weapon_count, gov_auth, current_log):
-        try:
+WELCOME_MESSAGE = "Welcome! Your command results will appear here."
 
-            # Create different types of boats based on user choice
-            if ship_type == "Boat":
-                new_boat = Boat(name, launch_date, location, flag)
-            elif ship_type == "CargoShip":
-                # Use the actual cargo capacity input from the user
-                new_boat = CargoBoat(
-                    name, launch_date, location, flag, cargo_capacity or 1000)
-            elif ship_type == "MilitaryBoat":
-                # Use the actual inputs from the user
-                new_boat = MilitaryBoat(
-                    name, launch_date, location, flag, weapon_count or 0, gov_auth)
-
-            # add boat to fleet
-            result = registry.add_boat(new_boat)
+# The console keeps about this many characters; older lines are dropped
+CONSOLE_MAX_CHARS = 200_000
 
-        except Exception as e:
-            result = f"❌ Error adding ship: {e}"
+# Page styling and header, built once at import time. Runs of whitespace are
+# collapsed to keep the HTML sent to the browser small.
+_FLEET_CSS_HTML: Final[str] = re.sub(r"\s+", " ", """
+<style>
+    body {background: radial-gradient(900px 500px at 10% 0%, #0b1220 0, #0b1220 30%, #0f172a 100%);}
+    .hero {padding: 22px; border-radius: 18px; background: linear-gradient(135deg, #0ea5e9 0%, #6366f1 60%, #a855f7 100%); color: #fff;
+         box-shadow: 0 10px 30px rgba(0,0,0,.25); border:1px solid rgba(255,255,255,.25)}
+    .hero h1 {margin: 0; font-size: 26px; font-weight: 800;}
+    .hero p {margin: 6px 0 0 0; opacity: .95}
+    .terminal textarea {background:#0b1220!important; color:#ffffff!important; border-radius:14px!important;
+                        border:1px solid #1f2a44!important; font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace!important;
+                        box-shadow: 0 8px 30px rgba(2, 8, 23, .6)}
+    .terminal textarea::placeholder {color:#ffffff!important; opacity:0.7!important;}
+    .terminal .label-wrap {color:#ffffff!important;}
+    .terminal .label-wrap span {color:#ffffff!important;}
+    .gr-button {border-radius: 999px!important; padding: 10px 14px!important; font-weight:700}
+    .panel{background:#0c1326; border:1px solid #18233c; border-radius:16px; padding:14px; box-shadow: 0 10px 30px rgba(0,0,0,.25)}
+    .gr-accordion{background:#0c1326!important; border-radius:14px!important; border:1px solid #18233c}
+    .gr-accordion .label-wrap{font-weight:700}
+</style>
+<div class="hero">
+  <h1>🚢 Fleet Command</h1>
+  <p>Monitor and manage your fleet with a clean, modern interface.</p>
+</div>
+""").strip()
+
+
+# Build each ship type offered in the Add form from the form's fields.
+# Each one ignores the fields that don't apply to it.
+def _mk_boat(name, launch_date, location, flag, cargo_capacity, weapon_count, gov_auth):
+    return Boat(name, launch_date, location, flag)
+
+
+def _mk_cargo(name, launch_date, location, flag, cargo_capacity, weapon_count, gov_auth):
+    # Use the actual cargo capacity input from the user
+    return CargoBoat(name, launch_date, location, flag, cargo_capacity or 1000)
+
+
+def _mk_military(name, launch_date, location, flag, cargo_capacity, weapon_count, gov_auth):
+    # Use the actual inputs from the user
+    return MilitaryBoat(name, launch_date, location, flag, weapon_count or 0, gov_auth)
+
+
+# Ship type names in the Add form -> function that builds that ship
+_SHIP_CTORS = {"Boat": _mk_boat, "CargoShip": _mk_cargo, "MilitaryBoat": _mk_military}
 
-        # return the updated log and keep current input values
-        return f"{current_log}\n> {result}", name, location, flag, launch_date, cargo_capacity, weapon_count, gov_auth
 
-    def report_and_update(current_log):
+def create_ui(registry: Fleet):
+    # Creates the Gradio web interface.
+  # Helper functions to interact with the registry and update the UI.
+  # Handlers only send back their new console text, and the browser appends
+  # it to the console.
+    def add_to_log(*entries):
+        # Join new console entries into the text to append
+        return "\n" + "\n".join(entries)
+
+    def add_and_update(names, locations, flags, launch_dates, ship_types, cargo_capacities, weapon_counts, gov_auths):
+        # Gradio groups Add clicks that are waiting in the queue into one call,
+        # so every argument is a list with one entry per click. The clicks can
+        # come from different browser sessions, so no per-session gr.State is
+        # passed in or out here.
+        results = []
+        new_boats = []
+        for name, location, flag, launch_date, ship_type, cargo_capacity, weapon_count, gov_auth in zip(
+                names, locations, flags, launch_dates, ship_types, cargo_capacities, weapon_counts, gov_auths):
+            try:
+                # Create different types of boats based on user choice
+                make_ship = _SHIP_CTORS.get(ship_type)
+                if make_ship is None:
+                    raise ValueError(f"Unknown ship type: {ship_type}")
+                new_boats.append(make_ship(
+                    name, launch_date, location, flag, cargo_capacity, weapon_count, gov_auth))
+                results.append(None)  # filled in once the boat is added
+            except Exception as e:
+                results.append(f"❌ Error adding ship: {e}")
+
+        # add all the new boats to the fleet in one go
+        version = registry._version
+        added = iter(registry.add_boats(new_boats))
+        results = [next(added) if r is None else r for r in results]
+
+        # return each click's new console text, keep current input values and
+        # refresh the ship dropdowns if a ship was added, all in one response
+        log_deltas = [f"\n> {r}" for r in results]
+        if registry._version != version:
+            dropdown = gr.update(choices=registry._name_cache)
+        else:
+            dropdown = gr.update()
+        dropdowns = [dropdown] * len(names)
+        return (log_deltas, names, locations, flags, launch_dates,
+                cargo_capacities, weapon_counts, gov_auths,
+                dropdowns, dropdowns, dropdowns, dropdowns)
+
+    def report_and_update():
         result = registry.generate_status_report()
-        logs = registry.show_logs()
-        new_log = f"{current_log}\n\n{result}\n"
-        return new_log
+        return add_to_log(f"\n{result}\n")
 
-    def list_and_update(current_log):
+    def list_and_update():
         result = registry.list_boats()
-        new_log = f"{current_log}\n\n{result}\n"
-        return new_log
+        return add_to_log(f"\n{result}\n")
 
-    def save_and_update(current_log):
+    def save_and_update():
         result = registry.save_to_file()
-        new_log = f"{current_log}\n> {result}"
-        return new_log
+        return add_to_log(f"> {result}")
 
-    def load_and_update(current_log):
+    def load_and_update(shown_version):
         result = registry.load_from_file()
-        new_log = f"{current_log}\n> {result}"
         # After loading, also list the boats to show what was loaded
         list_result = registry.list_boats()
-        return f"{new_log}\n\n{list_result}\n"
+        return (add_to_log(f"> {result}", f"\n{list_result}\n"),
+                *update_ship_dropdown(shown_version))
 
-    def filter_and_update(keyword, current_log):
+    def filter_and_update(keyword):
         if not keyword or not keyword.strip():
             result = "❌ Please enter a keyword to filter by."
         else:
             result = registry.filter_boats(keyword.strip())
-        new_log = f"{current_log}\n\n🔍 Filter Results for '{keyword}':\n{result}\n"
-        return new_log
+        return add_to_log(f"\n🔍 Filter Results for '{keyword}':\n{result}\n")
 
-    def sort_and_update(current_log):
+    def sort_and_update():
         result = registry.sort_boats()
-        new_log = f"{current_log}\n> {result}"
         # After sorting, show the sorted list
         list_result = registry.list_boats()
-        return f"{new_log}\n\n{list_result}\n"
+        return add_to_log(f"> {result}", f"\n{list_result}\n")
 
-    def logs_and_update(current_log):
+    def logs_and_update():
         result = registry.show_logs()
-        new_log = f"{current_log}\n\n📝 Fleet Logs:\n{result}\n"
-        return new_log
+        return add_to_log(f"\n📝 Fleet Logs:\n{result}\n")
 
-    def record_arrival_and_update(ship_name, location, current_log):
+    def record_arrival_and_update(ship_name, location):
         if not ship_name or not location:
             result = "❌ Please select a ship and enter a location."
         else:
             # Find the ship by name
-            selected_ship = None
-            for boat in registry.boats:
-                if boat.name == ship_name:
-                    selected_ship = boat
-                    break
+            selected_ship = registry.boats_by_name.get(ship_name)
 
             if selected_ship:
                 result = registry.record_arrival(selected_ship, location)
             else:
                 result = f"❌ Ship '{ship_name}' not found in fleet."
 
-        new_log = f"{current_log}\n> {result}"
-        return new_log
+        return add_to_log(f"> {result}")
 
-    def log_position_and_update(ship_name, position, current_log):
+    def log_position_and_update(ship_name, position):
         if not ship_name or not position:
             result = "❌ Please select a ship and enter a position."
         else:
             # Find the ship by name
-            selected_ship = None
-            for boat in registry.boats:
-                if boat.name == ship_name:
-                    selected_ship = boat
-                    break
+            selected_ship = registry.boats_by_name.get(ship_name)
 
             if selected_ship:
                 result = selected_ship.log_position(position)
             else:
                 result = f"❌ Ship '{ship_name}' not found in fleet."
 
-        new_log = f"{current_log}\n> {result}"
-        return new_log
+        return add_to_log(f"> {result}")
 
-    def view_position_history_and_update(ship_name, current_log):
+    def view_position_history_and_update(ship_name):
         if not ship_name:
             result = "❌ Please select a ship to view history."
         else:
             # Find the ship by name
-            selected_ship = None
-            for boat in registry.boats:
-                if boat.name == ship_name:
-                    selected_ship = boat
-                    break
+            selected_ship = registry.boats_by_name.get(ship_name)
 
             if selected_ship:
                 result = selected_ship.get_position_history()
             else:
                 result = f"❌ Ship '{ship_name}' not found in fleet."
 
-        new_log = f"{current_log}\n\n{result}\n"
-        return new_log
+        return add_to_log(f"\n{result}\n")
 
-    def remove_boat_and_update(ship_name, current_log):
+    def remove_boat_and_update(ship_name, shown_version):
         if not ship_name:
             result = "❌ Please select a ship to remove."
         else:
             # Find the ship by name
-            selected_ship = None
-            for boat in registry.boats:
-                if boat.name == ship_name:
-                    selected_ship = boat
-                    break
+            selected_ship = registry.boats_by_name.get(ship_name)
 
             if selected_ship:
                 result = registry.remove_boat(selected_ship)
             else:
                 result = f"❌ Ship '{ship_name}' not found in fleet."
 
-        new_log = f"{current_log}\n> {result}"
-        return new_log
-
-    def clear_console():
-        """Clear the console like terminal clear command"""
-        return "Welcome! Your command results will appear here."
+        return (add_to_log(f"> {result}"),
+                *update_ship_dropdown(shown_version))
 
-    def update_ship_dropdown():
-        choices = [boat.name for boat in registry.boats]
-        return (gr.update(choices=choices),
-                gr.update(choices=choices),
-                gr.update(choices=choices),
-                gr.update(choices=choices))
+    def update_ship_dropdown(shown_version):
+        # Leave the dropdowns alone if the fleet hasn't changed since they
+        # were last filled (e.g. after a failed Add)
+        if shown_version == registry._version:
+            return gr.update(), gr.update(), gr.update(), gr.update(), shown_version
+        # all four dropdowns share the fleet's cached list of names
+        update = gr.update(choices=registry._name_cache)
+        return update, update, update, update, registry._version
 
     # Define the Gradio interface layout
     with gr.Blocks(theme=gr.themes.Soft(), title="Fleet Command") as app:
-        gr.HTML(
-            """
-            <style>
-                body {background: radial-gradient(900px 500px at 10% 0%, #0b1220 0, #0b1220 30%, #0f172a 100%);}
-                .hero {padding: 22px; border-radius: 18px; background: linear-gradient(135deg, #0ea5e9 0%, #6366f1 60%, #a855f7 100%); color: #fff;
-                     box-shadow: 0 10px 30px rgba(0,0,0,.25); border:1px solid rgba(255,255,255,.25)}
-                .hero h1 {margin: 0; font-size: 26px; font-weight: 800;}
-                .hero p {margin: 6px 0 0 0; opacity: .95}
-                .terminal textarea {background:#0b1220!important; color:#ffffff!important; border-radius:14px!important;
-                                    border:1px solid #1f2a44!important; font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, monospace!important;
-                                    box-shadow: 0 8px 30px rgba(2, 8, 23, .6)}
-                .terminal textarea::placeholder {color:#ffffff!important; opacity:0.7!important;}
-                .terminal .label-wrap {color:#ffffff!important;}
-                .terminal .label-wrap span {color:#ffffff!important;}
-                .gr-button {border-radius: 999px!important; padding: 10px 14px!important; font-weight:700}
-                .panel{background:#0c1326; border:1px solid #18233c; border-radius:16px; padding:14px; box-shadow: 0 10px 30px rgba(0,0,0,.25)}
-                .gr-accordion{background:#0c1326!important; border-radius:14px!important; border:1px solid #18233c}
-                .gr-accordion .label-wrap{font-weight:700}
-            </style>
-            <div class="hero">
-              <h1>🚢 Fleet Command</h1>
-              <p>Monitor and manage your fleet with a clean, modern interface.</p>
-            </div>
-            """
-        )
+        # Fleet version the ship dropdowns were last filled from
+        dropdown_version = gr.State(None)
+        gr.HTML(_FLEET_CSS_HTML)
         with gr.Row():
             with gr.Column(scale=2):
                 log_textbox = gr.Textbox(
                     label="Log & Reports",
-                    value="Welcome! Your command results will appear here.",
+                    value=WELCOME_MESSAGE,
                     lines=16,
                     interactive=True,
                     elem_classes=["terminal"]  # styling only
                 )
+                # new console text from the last command, appended by the browser
+                log_delta = gr.Textbox(visible=False)
             with gr.Column(scale=1):
                 with gr.Group(elem_classes=["panel"]):
                     gr.Markdown("### Quick Actions")
@@ -591,20 +1166,13 @@ def create_ui(registry: Fleet):
                     gov_auth_input = gr.Checkbox(
                         label="Authorised by Government?")
 
-                # extra fields based on ship type
-                def toggle_extra_field(selected_type):
-                    if selected_type == "CargoShip":
-                        return gr.update(visible=True), gr.update(visible=False)
-                    elif selected_type == "MilitaryBoat":
-                        return gr.update(visible=False), gr.update(visible=True)
-                    else:
-                        # Hide both
-                        return gr.update(visible=False), gr.update(visible=False)
-
+                # extra fields based on ship type, shown or hidden in the browser
                 ship_type.change(
-                    fn=toggle_extra_field,
+                    fn=None,
                     inputs=[ship_type],
-                    outputs=[cargo_inputs, military_inputs]
+                    outputs=[cargo_inputs, military_inputs],
+                    js="(t) => [{__type__: 'update', visible: t == 'CargoShip'}, "
+                       "{__type__: 'update', visible: t == 'MilitaryBoat'}]"
                 )
 
                 add_btn = gr.Button("Add Ship")
@@ -666,8 +1234,15 @@ def create_ui(registry: Fleet):
                     )
                     remove_boat_btn = gr.Button("🗑️ Remove Ship")
 
-        # Connect UI components to the helper functions
-        add_btn.click(
+        # Connect UI components to the helper functions.
+        # Add, Load and Remove also refresh these ship dropdowns.
+        ship_dropdowns = [ship_select, ship_position_select,
+                          ship_history_select, ship_remove_select]
+        # Handlers that change or snapshot the fleet, or read a ship's
+        # position history, share one queue slot so two of them never run at
+        # once. Report, List, Filter and Logs only read and run in parallel.
+        fleet_writes = dict(concurrency_limit=1, concurrency_id="fleet_writes")
+        add_event = add_btn.click(
             fn=add_and_update,
             inputs=[
                 name_input,
@@ -677,47 +1252,51 @@ def create_ui(registry: Fleet):
                 ship_type,
                 cargo_capacity_input,
                 weapon_count_input,
-                gov_auth_input,
-                log_textbox
+                gov_auth_input
             ],
-            outputs=[log_textbox, name_input, home_port_input, flag_input,
-                     date_input, cargo_capacity_input, weapon_count_input, gov_auth_input]
+            outputs=[log_delta, name_input, home_port_input, flag_input,
+                     date_input, cargo_capacity_input, weapon_count_input, gov_auth_input,
+                     *ship_dropdowns],
+            batch=True,
+            max_batch_size=16,
+            **fleet_writes
         )
-        report_btn.click(fn=report_and_update, inputs=[
-                         log_textbox], outputs=[log_textbox])
-        list_btn.click(fn=list_and_update, inputs=[
-                       log_textbox], outputs=[log_textbox])
-        sort_btn.click(fn=sort_and_update, inputs=[
-                       log_textbox], outputs=[log_textbox])
-        save_btn.click(fn=save_and_update, inputs=[
-                       log_textbox], outputs=[log_textbox])
-        load_btn.click(fn=load_and_update, inputs=[
-                       log_textbox], outputs=[log_textbox])
-        filter_btn.click(fn=filter_and_update, inputs=[
-                         filter_input, log_textbox], outputs=[log_textbox])
-        logs_btn.click(fn=logs_and_update, inputs=[
-            log_textbox], outputs=[log_textbox])
-
-        record_arrival_btn.click(fn=record_arrival_and_update, inputs=[
-            ship_select, arrival_location_input, log_textbox], outputs=[log_textbox])
-
-        log_position_btn.click(fn=log_position_and_update, inputs=[
-            ship_position_select, position_input, log_textbox], outputs=[log_textbox])
-        view_history_btn.click(fn=view_position_history_and_update, inputs=[
-            ship_history_select, log_textbox], outputs=[log_textbox])
-
-        # Connect the missing buttons
-        clear_btn.click(fn=clear_console, outputs=[log_textbox])
-        remove_boat_btn.click(fn=remove_boat_and_update, inputs=[
-            ship_remove_select, log_textbox], outputs=[log_textbox])
-
-        # Update ship dropdown when boats are added, loaded, or removed
-        add_btn.click(fn=update_ship_dropdown, outputs=[
-            ship_select, ship_position_select, ship_history_select, ship_remove_select])
-        load_btn.click(fn=update_ship_dropdown, outputs=[
-            ship_select, ship_position_select, ship_history_select, ship_remove_select])
-        remove_boat_btn.click(fn=update_ship_dropdown, outputs=[
-            ship_select, ship_position_select, ship_history_select, ship_remove_select])
+        report_event = report_btn.click(fn=report_and_update, outputs=[log_delta])
+        list_event = list_btn.click(fn=list_and_update, outputs=[log_delta])
+        sort_event = sort_btn.click(fn=sort_and_update, outputs=[log_delta], **fleet_writes)
+        save_event = save_btn.click(fn=save_and_update, outputs=[log_delta], **fleet_writes)
+        load_event = load_btn.click(fn=load_and_update, inputs=[
+                       dropdown_version], outputs=[log_delta, *ship_dropdowns, dropdown_version],
+            **fleet_writes)
+        filter_event = filter_btn.click(fn=filter_and_update, inputs=[
+                         filter_input], outputs=[log_delta])
+        logs_event = logs_btn.click(fn=logs_and_update, outputs=[log_delta])
+
+        arrival_event = record_arrival_btn.click(fn=record_arrival_and_update, inputs=[
+            ship_select, arrival_location_input], outputs=[log_delta], **fleet_writes)
+
+        position_event = log_position_btn.click(fn=log_position_and_update, inputs=[
+            ship_position_select, position_input], outputs=[log_delta], **fleet_writes)
+        history_event = view_history_btn.click(fn=view_position_history_and_update, inputs=[
+            ship_history_select], outputs=[log_delta], **fleet_writes)
+
+        # Connect the missing buttons. Clearing the console happens in the browser.
+        clear_btn.click(fn=None, outputs=[log_textbox],
+                        js=f"() => {json.dumps(WELCOME_MESSAGE)}")
+        remove_event = remove_boat_btn.click(fn=remove_boat_and_update, inputs=[
+            ship_remove_select, dropdown_version], outputs=[log_delta, *ship_dropdowns, dropdown_version],
+            **fleet_writes)
+
+        # Add each handler's new text to the end of the console, dropping the
+        # oldest lines once it passes CONSOLE_MAX_CHARS. This runs in the
+        # browser, so the full log is never sent back and forth.
+        append_js = ("(delta, text) => { const t = text + delta; "
+                     f"return t.length <= {CONSOLE_MAX_CHARS} ? t : "
+                     f"t.slice(t.indexOf('\\n', t.length - {CONSOLE_MAX_CHARS}) + 1); }}")
+        for event in (add_event, report_event, list_event, sort_event, save_event, load_event, filter_event,
+                      logs_event, arrival_event, position_event, history_event, remove_event):
+            event.then(fn=None, inputs=[log_delta, log_textbox], outputs=[log_textbox],
+                       js=append_js)
 
     return app
 
@@ -731,4 +1310,7 @@ if __name__ == "__main__":
     print(initial_load_message)  # Print to terminal for the developer
     # Create and launch the Gradio app
     web_app = create_ui(fleet_registry)
-    web_app.launch(share=True)
+    # Let up to 4 clicks be handled at once, and only open a public
+    # share link when GRADIO_SHARE=1 is set
+    web_app.queue(default_concurrency_limit=4, max_size=64)
+    web_app.launch(share=os.getenv("GRADIO_SHARE") == "1")